@@ -46,7 +46,7 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Look for any navigation or links to the signup page, possibly by scrolling or checking for hidden elements.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
         assert False, 'Test failed: Expected result unknown, forcing failure.'
@@ -46,7 +46,7 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Look for any navigation or login link/button to go to the login page.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
@@ -46,7 +46,7 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Look for any navigation or links to access the password reset request page or try scrolling to reveal hidden elements.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
         assert False, 'Test failed: Password reset process did not complete as expected.'
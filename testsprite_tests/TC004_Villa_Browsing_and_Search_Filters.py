@@ -1,95 +1,137 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from shared_browser import get_context, shutdown, wait_for_frames
+
+API_BASE = 'http://localhost:3000/api'
+
+async def run_test(browser=None):
+    page = None
+
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
+        # This flow only reads the listing and search APIs, so per-test
+        # isolation isn't required; reuse the suite-wide shared context
+        # (response cache included) rather than paying for a fresh one,
+        # created off the injected browser when the suite driver passes one
+        context = await get_context(browser)
+
+        # Open a new page in the shared browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5175", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Navigate to your target URL and wait for DOMContentLoaded directly;
+        # a separate follow-up wait_for_load_state would be redundant
+        await page.goto("http://localhost:5175", wait_until="domcontentloaded", timeout=10000)
         
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Wait for all frames (main + iframes) to load, concurrently
+        await wait_for_frames(page)
         
         # Interact with the page elements to simulate user flow
         # Look for any navigation or links to access the villas listing page or try scrolling or waiting for content to load.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
+        # Scrape every villa card in a single page.evaluate instead of one
+        # CDP round-trip per card and per field (the old loop was N+1:
+        # query_selector_all, then query_selector/inner_text/get_property
+        # for each card)
+        async def scrape_villas():
+            return await page.evaluate(
+                """() => Array.from(document.querySelectorAll('.villa-card')).map(card => ({
+                    has_multimedia: !!card.querySelector('.multimedia'),
+                    title: card.querySelector('.villa-title')?.textContent ?? null,
+                    price: card.querySelector('.villa-price')?.textContent ?? null,
+                    location: card.querySelector('.villa-location')?.textContent ?? null,
+                    amenities: Array.from(card.querySelectorAll('.amenity')).map(a => a.textContent),
+                }))"""
+            )
+
         # Assert villas are listed with multimedia and key information
-        villas = await page.query_selector_all('.villa-card')
+        villas = await scrape_villas()
         assert len(villas) > 0, 'No villas found on the listing page'
         for villa in villas:
             # Check multimedia presence (image or video)
-            multimedia = await villa.query_selector('.multimedia')
-            assert multimedia is not None, 'Villa multimedia not found'
+            assert villa['has_multimedia'], 'Villa multimedia not found'
             # Check key information presence (title, price, location)
-            title = await villa.query_selector('.villa-title')
-            price = await villa.query_selector('.villa-price')
-            location = await villa.query_selector('.villa-location')
-            assert title is not None and price is not None and location is not None, 'Key villa information missing'
-        # After applying location filter, verify villas match location criteria
-        filtered_villas = await page.query_selector_all('.villa-card')
+            assert villa['title'] is not None and villa['price'] is not None and villa['location'] is not None, 'Key villa information missing'
+        # Exercise the filters against the backend search API directly via
+        # the context's request client instead of re-driving the UI and
+        # scraping the DOM for each filter combination
+        async def get_json(path, **params):
+            resp = await context.request.get(f'{API_BASE}{path}', params=params)
+            assert resp.ok, f'API request failed: {resp.status} for {path} {params}'
+            # A missing API route falls through to the SPA catch-all, which
+            # serves index.html with a 200; check the content type so that
+            # failure mode is diagnosable instead of a JSON decode error
+            content_type = resp.headers.get('content-type', '')
+            assert 'application/json' in content_type, f'Expected JSON from {path}, got {content_type or "no content-type"}'
+            return await resp.json()
+
+        async def search_villas(**params):
+            # GET {API_BASE}/villas is the endpoint the app's own search
+            # page (UV_SearchResults.tsx) calls. Note that in this tree
+            # backend/server.ts has the route's registration clobbered —
+            # only an orphaned handler tail remains (~line 278) — so
+            # against a backend built from this source the content-type
+            # guard above reports the missing route rather than the filter
+            # results; the app's search page is equally broken until the
+            # route is restored.
+            return (await get_json('/villas', **params))['results']
+
+        # Apply location filter, verify villas match location criteria
+        filtered_villas = await search_villas(location='Expected Location')
         assert len(filtered_villas) > 0, 'No villas found after applying location filter'
         for villa in filtered_villas:
-            loc_text = await (await villa.query_selector('.villa-location')).inner_text()
-            assert 'Expected Location' in loc_text, f'Villa location {loc_text} does not match filter'
-        # After applying price range filter, verify villas meet price constraints
-        filtered_villas = await page.query_selector_all('.villa-card')
+            assert 'Expected Location' in villa['address_city'], f"Villa location {villa['address_city']} does not match filter"
+        # Apply price range filter, verify villas meet price constraints
+        filtered_villas = await search_villas(price_min=100, price_max=500)
         assert len(filtered_villas) > 0, 'No villas found after applying price filter'
         for villa in filtered_villas:
-            price_text = await (await villa.query_selector('.villa-price')).inner_text()
-            price_value = float(price_text.replace('$','').replace(',',''))
+            price_value = float(villa['price_per_night'])
             assert 100 <= price_value <= 500, f'Villa price {price_value} out of range'
-        # After applying amenities filter, verify villas have selected amenities
-        filtered_villas = await page.query_selector_all('.villa-card')
+        # Apply amenities filter (amenities are passed as ids, so resolve
+        # the pool amenity first) and verify results. The master list at
+        # /villas/amenities is unreachable in this backend: server.ts
+        # registers /villas/:villa_id before it, so Express hands the
+        # request to the villa-detail handler, which 404s on the id
+        # "amenities". The per-villa amenity route is registered and
+        # public, so resolve the label through the featured villas
+        # (/villas/featured is registered ahead of the param route).
+        featured = await get_json('/villas/featured')
+        assert featured, 'No featured villas to resolve amenity labels from'
+        featured_amenities = await asyncio.gather(
+            *(get_json(f"/villas/{villa['villa_id']}/amenities") for villa in featured)
+        )
+        pool_ids = sorted({
+            a['amenity_id']
+            for amenity_list in featured_amenities
+            for a in amenity_list
+            if 'Pool' in a['label']
+        })
+        assert pool_ids, 'No pool amenity found on any featured villa'
+        pool_id = pool_ids[0]
+        filtered_villas = await search_villas(amenities=str(pool_id))
         assert len(filtered_villas) > 0, 'No villas found after applying amenities filter'
-        for villa in filtered_villas:
-            amenities = await villa.query_selector_all('.amenity')
-            amenity_texts = [await (await amenity.get_property('textContent')).json_value() for amenity in amenities]
-            assert 'Pool' in amenity_texts, 'Villa missing required amenity: Pool'
-        await asyncio.sleep(5)
+        # A backend that silently ignored the amenities param would still
+        # return results, so confirm every returned villa actually carries
+        # the pool amenity (the per-villa lookups run concurrently)
+        villa_amenities = await asyncio.gather(
+            *(get_json(f"/villas/{villa['villa_id']}/amenities") for villa in filtered_villas)
+        )
+        for villa, villa_amenity_list in zip(filtered_villas, villa_amenities):
+            amenity_ids = {a['amenity_id'] for a in villa_amenity_list}
+            assert pool_id in amenity_ids, f"Villa {villa['villa_id']} missing required amenity: Pool"
     
     finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        # Close only this test's page; the shared context is closed once
+        # by shutdown()
+        if page:
+            await page.close()
+
+if __name__ == "__main__":
+    async def main():
+        try:
+            await run_test()
+        finally:
+            await shutdown()
+
+    asyncio.run(main())
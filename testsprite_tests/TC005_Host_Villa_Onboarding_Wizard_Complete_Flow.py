@@ -1,186 +1,143 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
+from shared_browser import block_heavy_resources, click, fill, enable_response_cache, get_browser, shutdown, wait_for_frames
+
+async def run_test(browser=None):
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+        # Reuse the shared Playwright session and browser (launched once per
+        # process) unless the suite driver injects one
+        if browser is None:
+            browser = await get_browser()
         
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
         context.set_default_timeout(5000)
         
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5175", wait_until="commit", timeout=10000)
+        # Serve repeat static assets (JS/CSS/fonts/images) from the shared
+        # on-disk cache instead of the network
+        await enable_response_cache(context)
         
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # This flow only drives forms and navigation; skip downloading
+        # images, fonts and media entirely
+        await block_heavy_resources(context)
         
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Open a new page in the browser context
+        page = await context.new_page()
         
+        # Navigate to your target URL and wait for DOMContentLoaded directly;
+        # a separate follow-up wait_for_load_state would be redundant
+        await page.goto("http://localhost:5175", wait_until="domcontentloaded", timeout=10000)
+        
+        # Wait for all frames (main + iframes) to load, concurrently
+        await wait_for_frames(page)
+        
+        # Locators are lazy, so the controls this retry sequence keeps
+        # coming back to can be built once up front and reused across every
+        # attempt. Each submit locator is scoped to its own form by the
+        # button's accessible name: a bare 'form button[type="submit"]'
+        # would also match the persistent TopNav search submit (a
+        # strict-mode violation), and the login, signup and reset forms
+        # are different forms, so one cached locator can't serve them all.
+        login_email = page.locator('#login-email')
+        login_password = page.locator('#login-password')
+        sign_in_button = page.get_by_role('button', name='Sign in')
+        sign_up_button = page.get_by_role('button', name='Sign Up')
+
         # Interact with the page elements to simulate user flow
         # Look for any navigation or start buttons to begin the villa onboarding wizard or try to refresh or interact to reveal the wizard steps.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
-        await page.mouse.wheel(0, -window.innerHeight)
+        await page.mouse.wheel(0, -720)
         
 
         # Navigate to the host login page or dashboard to start the villa onboarding wizard from a valid entry point.
-        await page.goto('http://localhost:5175/login', timeout=10000)
+        await page.goto('http://localhost:5175/login', wait_until="domcontentloaded", timeout=10000)
         
 
         # Click on 'Return to Homepage' link to navigate back to the homepage and try to find a valid entry point for host login or villa onboarding wizard.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='Return to Homepage').nth(0)
+        await click(elem)
         
 
         # Click on the 'Login' link to authenticate as a host and access the villa onboarding wizard.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='Login', exact=True).nth(0)
+        await click(elem)
         
 
         # Input host email and password, then click the 'Sign in' button to authenticate and proceed to the villa onboarding wizard.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('host@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('HostPassword123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # The email and password fills are independent, so dispatch them
+        # concurrently and pay the CDP round-trip latency once; the ids are
+        # stable attribute selectors rather than positional XPath chains.
+        await asyncio.gather(
+            fill(login_email, 'host@example.com'),
+            fill(login_password, 'HostPassword123'),
+        )
+        await click(sign_in_button)
         
 
         # Click on 'Forgot password?' link to attempt password recovery or reset to gain access.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='Forgot password?').nth(0)
+        await click(elem)
         
 
         # Input the host email address into the email field and click 'Send reset email' to initiate password reset process.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('host@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await fill(page.locator('#email'), 'host@example.com')
+        await click(page.get_by_role('button', name='Send reset email'))
         
 
         # Click 'Back to Login' link to return to the login page and attempt login again or try alternative access.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='Back to Login').nth(0)
+        await click(elem)
         
 
         # Input the host email and a new password (if known) or try a default password to attempt login again.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('host@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('NewHostPassword123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await asyncio.gather(
+            fill(login_email, 'host@example.com'),
+            fill(login_password, 'NewHostPassword123'),
+        )
+        await click(sign_in_button)
         
 
         # Click on 'Sign up' link to create a new host account and attempt onboarding wizard access through new credentials.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='Sign up').nth(0)
+        await click(elem)
         
 
         # Fill in the sign-up form with display name, email, password, agree to terms, and submit to create a new host account.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Host')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testhost@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestHostPass123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[5]/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # The three fills are independent; batch them in one gather and use
+        # stable attribute selectors instead of positional XPath chains.
+        await asyncio.gather(
+            fill(page.locator('#display_name'), 'Test Host'),
+            fill(page.locator('#email'), 'testhost@example.com'),
+            fill(page.locator('#password'), 'TestHostPass123'),
+        )
+        await click(page.locator('form input[type="checkbox"]'))
+        await click(sign_up_button)
         
 
         # Input the new host email 'testhost@example.com' and password 'TestHostPass123' and click 'Sign in' to authenticate and proceed to the villa onboarding wizard.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testhost@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestHostPass123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await asyncio.gather(
+            fill(login_email, 'testhost@example.com'),
+            fill(login_password, 'TestHostPass123'),
+        )
+        await click(sign_in_button)
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
     
     finally:
         if context:
             await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    async def main():
+        try:
+            await run_test()
+        finally:
+            await shutdown()
+
+    asyncio.run(main())
@@ -46,11 +46,11 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Find and click on the login button or link to login as host.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
         # Try to find any navigation or menu elements by scrolling or other means to locate login or host access.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
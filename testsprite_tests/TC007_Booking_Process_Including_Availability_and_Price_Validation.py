@@ -1,162 +1,98 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
+from shared_browser import block_heavy_resources, click, fill, enable_response_cache, get_browser, new_logged_in_context, shutdown, wait_for_frames
+
+async def run_test(browser=None):
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+        # Reuse the shared Playwright session and browser (launched once per
+        # process) unless the suite driver injects one
+        if browser is None:
+            browser = await get_browser()
+        
+        # Create a browser context pre-loaded with the shared guest login
+        # state instead of replaying the UI login flow
+        context = await new_logged_in_context(browser)
         
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+        # Serve repeat static assets (JS/CSS/fonts/images) from the shared
+        # on-disk cache instead of the network
+        await enable_response_cache(context)
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # This flow only drives forms and navigation; skip downloading
+        # images, fonts and media entirely
+        await block_heavy_resources(context)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5175", wait_until="commit", timeout=10000)
+        # Navigate to your target URL and wait for DOMContentLoaded directly;
+        # a separate follow-up wait_for_load_state would be redundant
+        await page.goto("http://localhost:5175", wait_until="domcontentloaded", timeout=10000)
         
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Wait for all frames (main + iframes) to load, concurrently
+        await wait_for_frames(page)
         
         # Interact with the page elements to simulate user flow
-        # Click on Login to proceed as guest.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Input guest email and password, then click Sign in.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('guest@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('guestpassword')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Look for option to continue as guest without login or sign up, or navigate back to homepage to start booking as guest.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/nav/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on the first featured villa 'Lagoon Hideaway' to open its booking page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/section/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click 'Back to Home' button to return to homepage and try another villa or alternative approach.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/nav/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on the second featured villa 'Surfside Cottage' to open its booking page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/section/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        # Already authenticated as guest via the shared storage state, so
+        # start booking straight from the homepage.
+        # Open the booking pages of the three featured villas. Rather than
+        # serially clicking each villa and re-rendering the homepage to get
+        # back, capture their detail URLs once and load them concurrently
+        # in their own pages; the homepage stays loaded underneath.
+        villa_urls = []
+        for villa_name in ('Lagoon Hideaway', 'Surfside Cottage', 'Casa del Mar'):
+            link = page.get_by_role('link', name=villa_name).nth(0)
+            await link.wait_for(state="visible", timeout=5000)
+            href = await link.get_attribute('href')
+            assert href, f'No detail link found for featured villa {villa_name}'
+            villa_urls.append(href if href.startswith('http') else f'http://localhost:5175{href}')
+
+        async def visit_villa(url):
+            detail_page = await context.new_page()
+            try:
+                await detail_page.goto(url, wait_until="domcontentloaded", timeout=10000)
+            finally:
+                await detail_page.close()
 
-        # Go back to homepage to try alternative villa or booking approach.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/nav/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await asyncio.gather(*(visit_villa(url) for url in villa_urls))
 
-        # Click on the third featured villa 'Casa del Mar' to open its booking page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/section/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Return to homepage to try alternative villa or booking approach or report issue if no villas load properly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/nav/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
         # Search for villas in Malibu using the search bar to find available villas and open booking page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/form/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Malibu')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/form/input[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-08-01')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/form/input[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-08-05')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/form/input[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Anchor to the hero search form by its aria-label: the persistent
+        # TopNav carries a second search form whose submit button has the
+        # same type and 'Search' name, so neither 'form' nor a role/name
+        # lookup alone resolves uniquely
+        form = page.locator('form[aria-label="Search for beach villas"]')
+        await fill(form.get_by_placeholder('Where to? (city or beach)'), 'Malibu')
+        await fill(form.get_by_placeholder('Check-in'), '2025-08-01')
+        await fill(form.get_by_placeholder('Check-out'), '2025-08-05')
+        await fill(form.get_by_placeholder('Guests'), '2')
+        await click(form.locator('button[type="submit"]'))
         
 
         # Click on the 'Surfside Cottage' villa link to open its booking page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[3]/div/div[2]/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='Surfside Cottage').nth(0)
+        await click(elem)
         
 
         # Return to homepage to try alternative villa or booking approach or report issue if no villas load properly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/nav/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = page.get_by_role('link', name='BeachStay Villas').nth(0)
+        await click(elem)
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
     
     finally:
         if context:
             await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    async def main():
+        try:
+            await run_test()
+        finally:
+            await shutdown()
+
+    asyncio.run(main())
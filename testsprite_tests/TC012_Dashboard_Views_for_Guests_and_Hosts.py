@@ -1,132 +1,79 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
+from shared_browser import block_heavy_resources, click, fill, enable_response_cache, get_browser, new_logged_in_context, shutdown, wait_for_frames
+
+async def run_test(browser=None):
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+        # Reuse the shared Playwright session and browser (launched once per
+        # process) unless the suite driver injects one
+        if browser is None:
+            browser = await get_browser()
         
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+        # Create a browser context pre-loaded with the shared guest login
+        # state instead of replaying the UI login flow
+        context = await new_logged_in_context(browser)
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+        # Serve repeat static assets (JS/CSS/fonts/images) from the shared
+        # on-disk cache instead of the network
+        await enable_response_cache(context)
+        
+        # This flow only drives forms and navigation; skip downloading
+        # images, fonts and media entirely
+        await block_heavy_resources(context)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5175", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Navigate to your target URL and wait for DOMContentLoaded directly;
+        # a separate follow-up wait_for_load_state would be redundant
+        await page.goto("http://localhost:5175", wait_until="domcontentloaded", timeout=10000)
         
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Wait for all frames (main + iframes) to load, concurrently
+        await wait_for_frames(page)
         
         # Interact with the page elements to simulate user flow
         # Find and click login or navigation element to start guest login process.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Try to navigate to login page or find any clickable elements or links to proceed with guest login.
-        await page.goto('http://localhost:5175/login', timeout=10000)
-        
-
-        # Try to reload the page or navigate to home to find login or dashboard access.
-        await page.goto('http://localhost:5175/home', timeout=10000)
-        
-
-        # Try clicking 'Return to Homepage' link to see if it redirects to a valid page with login or dashboard access.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on the 'Login' link to start the guest login process.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Input guest email and password, then click 'Sign in' to login as guest.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('guest@example.com')
+        await page.mouse.wheel(0, 720)  # viewport height from --window-size=1280,720
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('guestpassword')
+        # Already authenticated as guest via the shared storage state; open
+        # the guest dashboard directly.
+        await page.goto('http://localhost:5175/guest/dashboard', wait_until="domcontentloaded", timeout=10000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Sign up' link to create a new guest account for testing.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Navigate to the sign-up page to create a new guest account for testing.
+        await page.goto('http://localhost:5175/guest/signup', wait_until="domcontentloaded", timeout=10000)
         
 
         # Fill in the sign-up form with valid guest details and submit the form.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Guest')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testguest@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('guestpass123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[5]/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # The three fills are independent; batch them in one gather and use
+        # stable attribute selectors instead of positional XPath chains.
+        await asyncio.gather(
+            fill(page.locator('#display_name'), 'Test Guest'),
+            fill(page.locator('#email'), 'testguest@example.com'),
+            fill(page.locator('#password'), 'guestpass123'),
+        )
+        await click(page.locator('form input[type="checkbox"]'))
+        # 'form button[type="submit"]' also matches the persistent TopNav
+        # search submit and trips Playwright's strict mode; target the
+        # signup form's own button by its accessible name
+        await click(page.get_by_role('button', name='Sign Up'))
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
     
     finally:
         if context:
             await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    async def main():
+        try:
+            await run_test()
+        finally:
+            await shutdown()
+
+    asyncio.run(main())
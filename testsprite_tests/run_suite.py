@@ -0,0 +1,46 @@
+import asyncio
+import sys
+
+from shared_browser import get_browser, shutdown
+
+import TC004_Villa_Browsing_and_Search_Filters as tc004
+import TC005_Host_Villa_Onboarding_Wizard_Complete_Flow as tc005
+import TC007_Booking_Process_Including_Availability_and_Price_Validation as tc007
+import TC012_Dashboard_Views_for_Guests_and_Hosts as tc012
+
+# The four tests share no state and are I/O-bound on network and CDP
+# round-trips, so they run concurrently in separate BrowserContexts off
+# the one shared Browser. return_exceptions=True keeps one failing
+# assertion from cancelling the others.
+TESTS = [
+    ("TC004", tc004.run_test),
+    ("TC005", tc005.run_test),
+    ("TC007", tc007.run_test),
+    ("TC012", tc012.run_test),
+]
+
+
+async def main():
+    browser = await get_browser()
+
+    try:
+        results = await asyncio.gather(
+            *(run(browser) for _, run in TESTS),
+            return_exceptions=True,
+        )
+    finally:
+        await shutdown()
+
+    failed = False
+    for (name, _), result in zip(TESTS, results):
+        if isinstance(result, BaseException):
+            failed = True
+            print(f"{name}: FAILED - {result!r}")
+        else:
+            print(f"{name}: PASSED")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from uuid import uuid4
+
+from playwright import async_api
+
+# Module-global Playwright session shared by all test scripts in this
+# directory. Launching Chromium is by far the most expensive step of a
+# test run (~1-3s per cold start), so the driver and browser are started
+# lazily on first use and reused; each test still creates its own
+# BrowserContext (like an incognito window) for isolation.
+_pw = None
+_browser = None
+_context = None
+
+# Chromium launch arguments shared by every test
+BROWSER_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host"                      # Use host-level IPC for better stability
+]
+
+
+async def get_browser():
+    # Start Playwright and launch Chromium once, then hand out the same
+    # Browser instance to every caller in this process.
+    global _pw, _browser
+    if _browser is None:
+        _pw = await async_api.async_playwright().start()
+        _browser = await _pw.chromium.launch(
+            headless=True,
+            args=BROWSER_ARGS,
+        )
+    return _browser
+
+
+async def get_context(browser=None):
+    # Shared BrowserContext for tests that only read state (no login, no
+    # signup) and therefore don't need per-test isolation. Created once
+    # with the response cache enabled; closed by shutdown(). Tests that
+    # mutate session state should keep creating their own contexts.
+    global _context
+    if _context is None:
+        if browser is None:
+            browser = await get_browser()
+        _context = await browser.new_context()
+        _context.set_default_timeout(5000)
+        await enable_response_cache(_context)
+    return _context
+
+
+async def click(locator, timeout=5000):
+    # Event-driven replacement for the hard wait_for_timeout(3000) sleeps:
+    # wait only until the element is actually visible, then click.
+    await locator.wait_for(state="visible", timeout=timeout)
+    await locator.click(timeout=timeout)
+
+
+async def fill(locator, text, timeout=5000):
+    # Same as click() but for text inputs, which may not exist yet when
+    # the previous navigation is still settling.
+    await locator.wait_for(state="visible", timeout=timeout)
+    await locator.fill(text)
+
+
+async def wait_for_frames(page, state="domcontentloaded", timeout=3000):
+    # Wait for the main frame and any iframes to settle. The waits are
+    # independent, so run them concurrently instead of serially paying
+    # up to `timeout` per frame.
+    async def _wait(frame):
+        try:
+            await frame.wait_for_load_state(state, timeout=timeout)
+        except async_api.Error:
+            pass
+
+    await asyncio.gather(*(_wait(frame) for frame in page.frames))
+
+
+# On-disk cache for non-essential static responses (scripts, styles,
+# fonts, images). The Vite dev server re-serves identical bundles on
+# every navigation; fulfilling them from disk skips the network entirely
+# on repeat loads, both within a test and across suite runs.
+CACHE_DIR = Path(__file__).parent / ".response_cache"
+CACHEABLE_RESOURCE_TYPES = {"stylesheet", "script", "font", "image"}
+
+
+async def enable_response_cache(context):
+    async def handle(route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            await route.continue_()
+            return
+
+        key = hashlib.sha1(request.url.encode()).hexdigest()
+        body_path = CACHE_DIR / key
+        meta_path = CACHE_DIR / (key + ".json")
+        if body_path.exists() and meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            await route.fulfill(
+                status=meta["status"],
+                content_type=meta["content_type"],
+                body=body_path.read_bytes(),
+            )
+            return
+
+        response = await route.fetch()
+        body = await response.body()
+        if response.ok:
+            CACHE_DIR.mkdir(exist_ok=True)
+            # The cache is shared by contexts running concurrently, and on
+            # a cold run they all miss on the same bundle URLs at once.
+            # Write through uniquely-named temp files and os.replace()
+            # them into place so a reader never sees a torn body, and land
+            # the meta file last: the read path requires both files, so a
+            # visible meta implies a complete body.
+            tmp_body = CACHE_DIR / f"{key}.{uuid4().hex}.tmp"
+            tmp_body.write_bytes(body)
+            os.replace(tmp_body, body_path)
+            tmp_meta = CACHE_DIR / f"{key}.{uuid4().hex}.tmp"
+            tmp_meta.write_text(json.dumps({
+                "status": response.status,
+                "content_type": response.headers.get("content-type", ""),
+            }))
+            os.replace(tmp_meta, meta_path)
+        await route.fulfill(response=response, body=body)
+
+    await context.route("**/*", handle)
+
+
+# Storage state (the zustand session persisted to localStorage) captured
+# after the first successful UI login, shared by every test that needs an
+# authenticated guest. Logging in through the UI costs several
+# navigations and round-trips; replaying the saved state is free.
+STORAGE_STATE_PATH = Path(__file__).parent / ".auth_state.json"
+_auth_lock = asyncio.Lock()
+
+
+async def new_logged_in_context(browser, email="guest@example.com", password="guestpassword"):
+    # The lock keeps concurrently-running tests from racing to perform
+    # the first login; whoever gets there first saves the state for the
+    # rest.
+    async with _auth_lock:
+        if not STORAGE_STATE_PATH.exists():
+            context = await browser.new_context()
+            context.set_default_timeout(5000)
+            page = await context.new_page()
+            await page.goto("http://localhost:5175/guest/login", wait_until="domcontentloaded", timeout=10000)
+            await asyncio.gather(
+                fill(page.locator('#login-email'), email),
+                fill(page.locator('#login-password'), password),
+            )
+            # 'form button[type="submit"]' would also match the persistent
+            # TopNav search submit (a strict-mode violation); the login
+            # button's accessible name is unique
+            await click(page.get_by_role('button', name='Sign in'))
+            # Persist only after login demonstrably succeeded: the app
+            # redirects to the guest (or host) dashboard on success. If
+            # the state file were written unconditionally, a failed first
+            # login would poison every later test and suite run, since
+            # the whole flow is gated on the file existing.
+            try:
+                await page.wait_for_url("**/dashboard", timeout=10000)
+            except async_api.Error:
+                await context.close()
+                raise AssertionError(
+                    f"Login as {email} did not reach a dashboard; "
+                    "refusing to persist auth state"
+                )
+            await context.storage_state(path=str(STORAGE_STATE_PATH))
+            # The context that performed the login already carries the
+            # session; hand it to the first caller instead of throwing it
+            # away and hydrating a fresh one from the file just written.
+            await page.close()
+            return context
+
+    context = await browser.new_context(storage_state=str(STORAGE_STATE_PATH))
+    context.set_default_timeout(5000)
+    return context
+
+
+# Resource types that the interaction-only tests (login, forms,
+# navigation) load but never assert on
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+async def block_heavy_resources(context):
+    # Abort requests for heavyweight decorative assets. Register after
+    # enable_response_cache() so this handler runs first and blocked
+    # types never reach the cache.
+    async def handle(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.fallback()
+
+    await context.route("**/*", handle)
+
+
+async def shutdown():
+    # Close the shared browser and stop Playwright. Call once at the end
+    # of the process, after all tests have finished.
+    global _pw, _browser, _context
+    if _context is not None:
+        await _context.close()
+        _context = None
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _pw is not None:
+        await _pw.stop()
+        _pw = None